@@ -84,6 +84,9 @@ class ReadWriteKaitaiStruct(KaitaiStruct):
 class KaitaiStream:
     def __init__(self, io):
         self._io = io
+        # Seekability cannot change over the stream's lifetime, so query it
+        # once here instead of on every sized read.
+        self._io_seekable = io.seekable()
         self.align_to_byte()
         self.bits_le = False
         self.bits_write_mode = False
@@ -382,14 +385,14 @@ class KaitaiStream:
         # first read the data unconditionally and check the length afterwards.
         if (
             n >= 8*1024*1024  # = 8 MiB
-            and self._io.seekable()
+            and self._io_seekable
         ):
             num_bytes_available = self.size() - self.pos()
             is_satisfiable = (n <= num_bytes_available)
 
         pos_before_read = None
         if is_satisfiable:
-            if self._io.seekable():
+            if self._io_seekable:
                 pos_before_read = self._io.tell()
             r = self._io.read(n)
             num_bytes_available = len(r)
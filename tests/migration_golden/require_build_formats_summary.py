@@ -1,21 +1,69 @@
 #!/usr/bin/env python3
-import argparse
 import json
+import sys
 from pathlib import Path
 
+_REQUIRED = frozenset(("engine", "target", "generated", "failed", "skipped", "status"))
+
+USAGE = (
+    "usage: require_build_formats_summary.py summary "
+    "[--expect-engine ENGINE] [--expect-target TARGET] [--allow-failures N]"
+)
+
+
+class _Args:
+    summary: Path
+    expect_engine: str | None = None
+    expect_target: str | None = None
+    allow_failures: int = 0
+
+
+def parse_args(argv: list[str]) -> _Args:
+    # Hand-rolled to keep startup cheap: this script runs once per
+    # build-formats job in CI, and argparse's parser construction would
+    # dominate its runtime.
+    args = _Args()
+    positionals: list[str] = []
+    it = iter(argv)
+    for arg in it:
+        if arg in ("-h", "--help"):
+            print(USAGE)
+            raise SystemExit(0)
+        if arg == "--expect-engine":
+            value = next(it, None)
+            if value is None:
+                raise SystemExit(USAGE)
+            args.expect_engine = value
+        elif arg == "--expect-target":
+            value = next(it, None)
+            if value is None:
+                raise SystemExit(USAGE)
+            args.expect_target = value
+        elif arg == "--allow-failures":
+            value = next(it, None)
+            if value is None:
+                raise SystemExit(USAGE)
+            try:
+                args.allow_failures = int(value)
+            except ValueError:
+                raise SystemExit(USAGE) from None
+        elif arg.startswith("-"):
+            raise SystemExit(f"{USAGE}\nunknown option: {arg}")
+        else:
+            positionals.append(arg)
+    if len(positionals) != 1:
+        raise SystemExit(USAGE)
+    args.summary = Path(positionals[0])
+    return args
+
 
 def main() -> int:
-    p = argparse.ArgumentParser(description="Validate tests/build-formats summary JSON")
-    p.add_argument("summary", type=Path)
-    p.add_argument("--expect-engine")
-    p.add_argument("--expect-target")
-    p.add_argument("--allow-failures", type=int, default=0)
-    args = p.parse_args()
-
-    data = json.loads(args.summary.read_text(encoding="utf-8"))
-    required = ["engine", "target", "generated", "failed", "skipped", "status"]
-    missing = [k for k in required if k not in data]
-    if missing:
+    args = parse_args(sys.argv[1:])
+
+    with args.summary.open("rb") as f:
+        data = json.load(f)
+    if not _REQUIRED.issubset(data):
+        missing = sorted(_REQUIRED.difference(data))
         raise SystemExit(f"missing fields in summary: {', '.join(missing)}")
 
     if args.expect_engine and data["engine"] != args.expect_engine:
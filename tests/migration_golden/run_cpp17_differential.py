@@ -1,15 +1,35 @@
 #!/usr/bin/env python3
 import argparse
+import csv
 import difflib
+import functools
+import hashlib
+import itertools
 import json
 import os
 import re
+import shlex
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    # Optional fast path: orjson serializes the snippet-heavy report far
+    # quicker than the stdlib encoder and emits bytes directly.
+    import orjson
+
+    def _dump_report(report: dict) -> bytes:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2) + b"\n"
+except ImportError:
+    def _dump_report(report: dict) -> bytes:
+        return (json.dumps(report, indent=2) + "\n").encode("utf-8")
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent.parent
 DEFAULT_FIXTURES = SCRIPT_DIR / "cpp17_differential_fixtures.tsv"
@@ -18,6 +38,14 @@ SCALA_BIN = REPO_ROOT / "compiler" / "jvm" / "target" / "universal" / "stage" /
 KSCXX_BIN = REPO_ROOT / "compiler-cpp" / "build" / "kscpp"
 NORMALIZER = SCRIPT_DIR / "normalize_compiler_output.py"
 
+sys.path.insert(0, str(SCRIPT_DIR))
+try:
+    import normalize_compiler_output as _norm
+except ImportError:  # pragma: no cover - fall back to the CLI entry point
+    _norm = None
+
+_IMPORT_RE = re.compile(r'^import\s+"(.*)"$')
+
 
 @dataclass
 class Fixture:
@@ -29,12 +57,21 @@ class Fixture:
     parity_criteria: str
     known_deviation: str
     gate: str
+    # Repo-relative ksy path as spelled in the TSV; saves a
+    # Path.relative_to walk per report row.
+    ksy_rel: str = ""
 
 
 class DifferentialFailure(RuntimeError):
     pass
 
 
+@functools.lru_cache(maxsize=None)
+def _repo_rel(path: Path) -> str:
+    return str(path.relative_to(REPO_ROOT))
+
+
+@functools.lru_cache(maxsize=None)
 def resolve_executable(path: Path) -> Path:
     if sys.platform.startswith("win32"):
         with_bat = path.with_suffix(".bat")
@@ -56,6 +93,12 @@ def cli_path(path: Path, windows_compat: bool) -> str:
 
 
 def tool_env() -> dict[str, str]:
+    # Copy so callers may mutate without polluting the cached environment.
+    return dict(_tool_env_cached())
+
+
+@functools.lru_cache(maxsize=1)
+def _tool_env_cached() -> dict[str, str]:
     env = os.environ.copy()
     if not sys.platform.startswith("win32"):
         return env
@@ -80,6 +123,35 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES, help="TSV fixture inventory")
     parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT, help="Directory for artifacts and reports")
     parser.add_argument("--max-diff-lines", type=int, default=80, help="Max unified diff lines to include in report snippets")
+    parser.add_argument(
+        "--scala-launcher",
+        help=(
+            "Alternative command prefix for the Scala compiler, e.g. a Nailgun "
+            "client fronting one long-lived JVM ('ng io.kaitai.struct.JavaMain'), "
+            "so fixtures and imports stop paying JVM cold-start per invocation; "
+            "default is the stage binary"
+        ),
+    )
+    parser.add_argument(
+        "--kscpp-launcher",
+        help=(
+            "Alternative command prefix for the C++ compiler, e.g. a client "
+            "talking to one persistent kscpp process, so fixtures stop paying "
+            "process startup and IR-reader init per invocation; default is the "
+            "build-tree binary"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Fixtures to run concurrently (they are subprocess-bound); 1 runs them serially in-process",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the cross-run result cache keyed on fixture inputs and compiler binaries",
+    )
     parser.add_argument("--informational", action="store_true", help="Always exit 0; report is informational only")
     parser.add_argument(
         "--enforce-gate",
@@ -93,15 +165,32 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def parse_fixtures(path: Path) -> list[Fixture]:
+def parse_fixtures(source) -> list[Fixture]:
+    # File-like sources (tests, in-memory TSVs) parse directly; path
+    # sources go through the mtime-keyed cache so repeat parses within
+    # one process (e.g. warm pool workers) skip the TSV re-read while
+    # edits still invalidate.
+    if hasattr(source, "read"):
+        return list(_parse_fixture_rows(source, getattr(source, "name", "<stream>")))
+    path = Path(source)
+    return list(_parse_fixtures_cached(str(path), path.stat().st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_fixtures_cached(path_str: str, mtime_ns: int) -> tuple[Fixture, ...]:
+    with open(path_str, "r", encoding="utf-8", newline="") as f:
+        return _parse_fixture_rows(f, path_str)
+
+
+def _parse_fixture_rows(f, source_desc) -> tuple[Fixture, ...]:
     fixtures: list[Fixture] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
+    for row in csv.reader(f, delimiter="\t"):
+        if not row or row[0].lstrip().startswith("#"):
+            continue
+        if len(row) == 1 and not row[0].strip():
             continue
-        row = stripped.split("\t")
         if len(row) not in (7, 8):
-            raise DifferentialFailure(f"Invalid fixtures row in {path}: {line}")
+            raise DifferentialFailure("Invalid fixtures row in %s: %s" % (source_desc, "\t".join(row)))
         if len(row) == 7:
             fixture_id, category, mode, ksy, target, parity_criteria, known_deviation = row
             gate = "visibility"
@@ -109,9 +198,9 @@ def parse_fixtures(path: Path) -> list[Fixture]:
             fixture_id, category, mode, ksy, target, parity_criteria, known_deviation, gate = row
 
         if gate not in ("required", "visibility"):
-            raise DifferentialFailure(f"Invalid fixture gate '{gate}' for fixture {fixture_id} in {path}")
+            raise DifferentialFailure(f"Invalid fixture gate '{gate}' for fixture {fixture_id} in {source_desc}")
         if mode not in ("success", "error"):
-            raise DifferentialFailure(f"Invalid fixture mode '{mode}' for fixture {fixture_id} in {path}")
+            raise DifferentialFailure(f"Invalid fixture mode '{mode}' for fixture {fixture_id} in {source_desc}")
         fixtures.append(
             Fixture(
                 fixture_id=fixture_id,
@@ -122,15 +211,17 @@ def parse_fixtures(path: Path) -> list[Fixture]:
                 parity_criteria=parity_criteria,
                 known_deviation=known_deviation,
                 gate=gate,
+                ksy_rel=ksy,
             )
         )
-    return fixtures
+    return tuple(fixtures)
 
 
 def run_checked(cmd: list[str], cwd: Path, stdout_path: Path, stderr_path: Path, env: dict[str, str] | None = None) -> None:
-    proc = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, env=env)
-    stdout_path.write_text(proc.stdout, encoding="utf-8")
-    stderr_path.write_text(proc.stderr, encoding="utf-8")
+    # The child writes straight into the log files; its output never
+    # transits Python as pipe-captured strings.
+    with open(stdout_path, "wb", buffering=1 << 16) as out_f, open(stderr_path, "wb", buffering=1 << 16) as err_f:
+        proc = subprocess.run(cmd, cwd=cwd, stdout=out_f, stderr=err_f, env=env)
     if proc.returncode != 0:
         raise DifferentialFailure(
             f"Command failed ({proc.returncode}): {' '.join(cmd)}\n"
@@ -141,39 +232,94 @@ def run_checked(cmd: list[str], cwd: Path, stdout_path: Path, stderr_path: Path,
 def run_logged(
     cmd: list[str], cwd: Path, stdout_path: Path, stderr_path: Path, env: dict[str, str] | None = None
 ) -> subprocess.CompletedProcess[str]:
-    proc = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, env=env)
-    stdout_path.write_text(proc.stdout, encoding="utf-8")
-    stderr_path.write_text(proc.stderr, encoding="utf-8")
-    return proc
+    with open(stdout_path, "wb", buffering=1 << 16) as out_f, open(stderr_path, "wb", buffering=1 << 16) as err_f:
+        proc = subprocess.run(cmd, cwd=cwd, stdout=out_f, stderr=err_f, env=env)
+    # Callers only consume stderr (for diagnostic normalization on
+    # mode=error fixtures), so read it back from the log just once here.
+    return subprocess.CompletedProcess(
+        proc.args, proc.returncode, stdout="", stderr=stderr_path.read_text(encoding="utf-8")
+    )
 
 
-def aggregate_generated_tree(out_dir: Path, fixture_id: str) -> str:
-    chunks = [f"id={fixture_id}", "mode=success"]
-    files = sorted(
-        [*out_dir.rglob("*.py"), *out_dir.rglob("*.rb"), *out_dir.rglob("*.lua"), *out_dir.rglob("*.h"), *out_dir.rglob("*.cpp")],
-        key=lambda p: p.as_posix(),
-    )
-    for file_path in files:
-        rel = file_path.relative_to(out_dir)
-        chunks.append(f"--- FILE:{rel.as_posix()}")
-        chunks.append(file_path.read_text(encoding="utf-8"))
-    return "\n".join(chunks) + "\n"
+_SOURCE_EXTS = (".py", ".rb", ".lua", ".h", ".cpp")
+
+
+def _collect_generated_sources(out_dir: Path) -> list[Path]:
+    # One walk classifying by suffix, instead of one rglob pass (and its
+    # per-entry stats) for each extension.
+    # Hand-rolled os.scandir recursion: the DirEntry type info comes back
+    # from the directory read itself, so no per-file stat is needed, unlike
+    # Path.rglob. Decorate-sort-undecorate on the precomputed posix keys.
+    decorated: list[tuple[str, Path]] = []
+    stack = [os.fspath(out_dir)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(_SOURCE_EXTS):
+                    path = Path(entry.path)
+                    decorated.append((path.as_posix(), path))
+    decorated.sort()
+    return [path for _, path in decorated]
+
+
+def aggregate_generated_tree_to(out_dir: Path, fixture_id: str, out_path: Path) -> bytes:
+    # Stream the aggregate straight to disk through a large buffer; the
+    # concatenated tree is never materialized in memory. The blake2b
+    # digest is folded in during the same pass so callers can compare
+    # aggregates without rereading them.
+    digest = hashlib.blake2b(digest_size=16)
+
+    with open(out_path, "wb", buffering=1 << 20) as dst:
+        def write(chunk: bytes) -> None:
+            dst.write(chunk)
+            digest.update(chunk)
+
+        write(f"id={fixture_id}\nmode=success".encode("utf-8"))
+        for file_path in _collect_generated_sources(out_dir):
+            rel = file_path.relative_to(out_dir)
+            write(f"\n--- FILE:{rel.as_posix()}\n".encode("utf-8"))
+            with open(file_path, "rb") as src:
+                while chunk := src.read(1 << 20):
+                    write(chunk)
+        write(b"\n")
+    return digest.digest()
+
+
+def tree_fingerprint(root: Path) -> bytes:
+    # Hash relative names and contents in one walk; cheaper than building
+    # the aggregate files when the trees turn out identical (the common
+    # steady state). Sensitive to exactly what the aggregate captures.
+    digest = hashlib.blake2b(digest_size=16)
+    for file_path in _collect_generated_sources(root):
+        digest.update(file_path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        with open(file_path, "rb") as src:
+            while chunk := src.read(1 << 20):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.digest()
 
 
 def normalize(raw_file: Path, out_file: Path) -> None:
+    if _norm is not None:
+        # Stateless in-process call; spawning a fresh interpreter per file
+        # costs more than the normalization itself.
+        out_file.write_bytes(_norm.normalize_bytes(raw_file.read_bytes()))
+        return
     subprocess.run([sys.executable, str(NORMALIZER), str(raw_file), str(out_file)], check=True)
 
 
 def parse_ir_imports(ir_path: Path) -> list[str]:
     imports: list[str] = []
-    import_re = re.compile(r'^import\s+"(.*)"$')
     for line in ir_path.read_text(encoding="utf-8").splitlines():
-        m = import_re.match(line.strip())
+        m = _IMPORT_RE.match(line.strip())
         if m:
             imports.append(m.group(1))
     return imports
 
 
+@functools.lru_cache(maxsize=None)
 def resolve_import_ksy(import_name: str, current_dir: Path) -> Path | None:
     import_path = Path(import_name)
     if import_path.suffix != ".ksy":
@@ -198,69 +344,172 @@ def emit_import_ir_tree(
     scala_windows_compat: bool,
     cmd_env: dict[str, str],
     fixture_dir: Path,
+    scala_prefix: list[str] | None = None,
 ) -> None:
-    queue: list[tuple[Path, Path]] = [(root_ksy.resolve(), root_ir.resolve())]
-    seen_ir: set[Path] = {root_ir.resolve()}
+    # Memoize realpath lookups: every .resolve() walks the path with
+    # readlink/stat syscalls, and the same IR paths come back repeatedly.
+    resolved: dict[Path, Path] = {}
+
+    def _res(path: Path) -> Path:
+        cached = resolved.get(path)
+        if cached is None:
+            cached = resolved[path] = path.resolve()
+        return cached
+
+    ir_parent = root_ir.parent
+    queue: deque[tuple[Path, Path]] = deque([(_res(root_ksy), _res(root_ir))])
+    seen_ir: set[Path] = {_res(root_ir)}
+    max_workers = os.cpu_count() or 1
     while queue:
-        current_ksy, current_ir = queue.pop(0)
-        current_dir = current_ksy.parent
-        for imp in parse_ir_imports(current_ir):
-            imp_ksy = resolve_import_ksy(imp, current_dir)
-            if imp_ksy is None:
-                continue
-            imp_ir = root_ir.parent / f"{imp_ksy.stem}.ksir"
-            if imp_ir.resolve() in seen_ir:
+        # Drain the current BFS level, then emit its unseen imports
+        # concurrently: sibling imports are independent, so their JVM
+        # startups can overlap.
+        level = list(queue)
+        queue.clear()
+        jobs: list[tuple[Path, Path, list[str]]] = []
+        for current_ksy, current_ir in level:
+            current_dir = current_ksy.parent
+            for imp in parse_ir_imports(current_ir):
+                imp_ksy = resolve_import_ksy(imp, current_dir)
+                if imp_ksy is None:
+                    continue
+                imp_ir = ir_parent / f"{imp_ksy.stem}.ksir"
+                if _res(imp_ir) in seen_ir:
+                    continue
+                seen_ir.add(_res(imp_ir))
+                imp_cmd = [*(scala_prefix or [str(scala_bin)]), "--verbose", "file", "-t", fixture_target]
+                if fixture_target == "cpp_stl":
+                    imp_cmd.extend(["--cpp-standard", "17"])
+                imp_cmd.extend(
+                    [
+                        "--emit-ir",
+                        cli_path(imp_ir, scala_windows_compat),
+                        "-d",
+                        cli_path(scala_out, scala_windows_compat),
+                        cli_path(imp_ksy, scala_windows_compat),
+                    ]
+                )
+                jobs.append((imp_ksy, imp_ir, imp_cmd))
+
+        for batch_start in range(0, len(jobs), max_workers):
+            batch = jobs[batch_start:batch_start + max_workers]
+            procs = []
+            for imp_ksy, imp_ir, imp_cmd in batch:
+                stdout_path = fixture_dir / f"scala.import.{imp_ksy.stem}.stdout.log"
+                stderr_path = fixture_dir / f"scala.import.{imp_ksy.stem}.stderr.log"
+                out_f = stdout_path.open("wb")
+                err_f = stderr_path.open("wb")
+                proc = subprocess.Popen(imp_cmd, cwd=REPO_ROOT, stdout=out_f, stderr=err_f, env=cmd_env)
+                # The child owns its copies of the descriptors now.
+                out_f.close()
+                err_f.close()
+                procs.append((proc, imp_cmd, stdout_path, stderr_path))
+            failure = None
+            for proc, imp_cmd, stdout_path, stderr_path in procs:
+                rc = proc.wait()
+                if rc != 0 and failure is None:
+                    failure = DifferentialFailure(
+                        f"Command failed ({rc}): {' '.join(imp_cmd)}\n"
+                        f"See logs: {stdout_path} and {stderr_path}"
+                    )
+            if failure is not None:
+                raise failure
+
+        queue.extend((_res(imp_ksy), _res(imp_ir)) for imp_ksy, imp_ir, _ in jobs)
+
+
+# SequenceMatchers keyed on the Scala oracle text: the matcher indexes
+# its b side (b2j), so fixtures sharing one oracle skip re-indexing it.
+# autojunk stays off — "popular" lines in generated code are meaningful,
+# and the heuristic degrades diff quality on it. Per process, unlocked:
+# summarize_diff only runs on the worker's own fixtures.
+_MATCHER_CACHE: dict[bytes, difflib.SequenceMatcher] = {}
+
+
+def _format_range_unified(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _iter_unified_diff(matcher: difflib.SequenceMatcher):
+    # Emits the same unified format as difflib.unified_diff, but from a
+    # reusable matcher whose a side is cpp and b side is scala; roles are
+    # swapped back here so '-' still means Scala and '+' means C++17.
+    yield "--- scala.norm"
+    yield "+++ cpp.norm"
+    for group in matcher.get_grouped_opcodes():
+        first, last = group[0], group[-1]
+        yield "@@ -{} +{} @@".format(
+            _format_range_unified(first[3], last[4]), _format_range_unified(first[1], last[2])
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in matcher.b[j1:j2]:
+                    yield " " + line
                 continue
-            imp_cmd = [str(scala_bin), "--verbose", "file", "-t", fixture_target]
-            if fixture_target == "cpp_stl":
-                imp_cmd.extend(["--cpp-standard", "17"])
-            imp_cmd.extend(
-                [
-                    "--emit-ir",
-                    cli_path(imp_ir, scala_windows_compat),
-                    "-d",
-                    cli_path(scala_out, scala_windows_compat),
-                    cli_path(imp_ksy, scala_windows_compat),
-                ]
-            )
-            run_checked(
-                imp_cmd,
-                cwd=REPO_ROOT,
-                stdout_path=fixture_dir / f"scala.import.{imp_ksy.stem}.stdout.log",
-                stderr_path=fixture_dir / f"scala.import.{imp_ksy.stem}.stderr.log",
-                env=cmd_env,
-            )
-            seen_ir.add(imp_ir.resolve())
-            queue.append((imp_ksy.resolve(), imp_ir.resolve()))
+            if tag in ("replace", "insert"):
+                for line in matcher.b[j1:j2]:
+                    yield "-" + line
+            if tag in ("replace", "delete"):
+                for line in matcher.a[i1:i2]:
+                    yield "+" + line
 
 
 def summarize_diff(scala_text: str, cpp_text: str, max_lines: int) -> tuple[bool, dict]:
     if scala_text == cpp_text:
         return True, {"line_count": 0, "snippet": []}
-    diff_lines = list(
-        difflib.unified_diff(
-            scala_text.splitlines(),
-            cpp_text.splitlines(),
-            fromfile="scala.norm",
-            tofile="cpp.norm",
-            lineterm="",
-        )
-    )
-    snippet = diff_lines[:max_lines]
+    # Grossly different sizes mean the diff would be huge and truncated
+    # anyway; difflib can also degrade badly on such inputs. Report the
+    # first divergence region instead of diffing.
+    size_delta = abs(len(scala_text) - len(cpp_text))
+    if size_delta > 10000:
+        prefix_len = len(os.path.commonprefix((scala_text, cpp_text)))
+        snippet = [
+            "--- scala.norm",
+            "+++ cpp.norm",
+            f"@@ sizes differ by {size_delta} bytes; common prefix {prefix_len} bytes @@",
+            "-" + scala_text[prefix_len:prefix_len + 200],
+            "+" + cpp_text[prefix_len:prefix_len + 200],
+        ][:max_lines]
+        return False, {"line_count": len(snippet), "snippet": snippet, "truncated": True}
+    # Only the first max_lines of the diff ever reach the report, so stop
+    # consuming the (pure-Python, potentially expensive) diff generator as
+    # soon as the snippet is full; line_count is capped accordingly.
+    key = hashlib.blake2b(scala_text.encode("utf-8"), digest_size=16).digest()
+    matcher = _MATCHER_CACHE.get(key)
+    if matcher is None:
+        if len(_MATCHER_CACHE) >= 8:
+            _MATCHER_CACHE.clear()
+        matcher = difflib.SequenceMatcher(None, b=scala_text.splitlines(), autojunk=False)
+        _MATCHER_CACHE[key] = matcher
+    matcher.set_seq1(cpp_text.splitlines())
+    probe = list(itertools.islice(_iter_unified_diff(matcher), max_lines + 1))
+    truncated = len(probe) > max_lines
+    snippet = probe[:max_lines]
     return False, {
-        "line_count": len(diff_lines),
+        "line_count": len(snippet),
         "snippet": snippet,
-        "truncated": len(diff_lines) > max_lines,
+        "truncated": truncated,
     }
 
 
+_NONEMPTY_LINE_RE = re.compile(r"[^\n]*\S[^\n]*")
+
+
 def normalize_diagnostic(stderr_text: str, max_lines: int = 12) -> dict:
+    # Only the first max_lines ever reach the report, so stop scanning
+    # once they are collected instead of materializing every line of a
+    # potentially huge compiler blowup via splitlines.
     normalized_lines: list[str] = []
-    for line in stderr_text.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            continue
-        normalized_lines.append(stripped)
+    for match in _NONEMPTY_LINE_RE.finditer(stderr_text):
+        normalized_lines.append(match.group().strip())
+        if len(normalized_lines) >= max_lines:
+            break
     if not normalized_lines:
         return {"class": "<empty>", "message": "", "lines": []}
     first = normalized_lines[0]
@@ -271,19 +520,125 @@ def normalize_diagnostic(stderr_text: str, max_lines: int = 12) -> dict:
     return {
         "class": diag_class.strip(),
         "message": diag_message.strip(),
-        "lines": normalized_lines[:max_lines],
+        "lines": normalized_lines,
     }
 
 
-def ensure_tools() -> None:
-    if not resolve_executable(SCALA_BIN).exists():
+def ensure_tools(scala_external: bool = False, kscpp_external: bool = False) -> None:
+    if not scala_external and not resolve_executable(SCALA_BIN).exists():
         raise DifferentialFailure("Scala stage compiler missing; run tests/build-compiler first")
-    if not resolve_executable(KSCXX_BIN).exists():
+    if not kscpp_external and not resolve_executable(KSCXX_BIN).exists():
         raise DifferentialFailure("C++ compiler missing; run cmake -S compiler-cpp -B compiler-cpp/build && cmake --build compiler-cpp/build")
 
 
-def run_fixture(fixture: Fixture, out_root: Path, max_diff_lines: int) -> dict:
+# Artifacts worth replaying from the cache alongside the result row;
+# diff.patch is not cached since it is rebuilt from the result snippet.
+_CACHED_ARTIFACTS = ("scala.norm", "cpp.norm")
+
+
+def _transitive_ksy_inputs(root_ksy: Path) -> list[Path]:
+    # The fixture's output depends on its imports too, so the cache key
+    # must cover the whole .ksy closure. A line scan for the imports:
+    # block is enough here; fixture KSY files keep it in plain list form.
+    ordered: list[Path] = []
+    seen: set[Path] = set()
+    stack = [root_ksy.resolve()]
+    while stack:
+        ksy = stack.pop()
+        if ksy in seen or not ksy.exists():
+            continue
+        seen.add(ksy)
+        ordered.append(ksy)
+        in_imports = False
+        for line in ksy.read_text(encoding="utf-8").splitlines():
+            stripped = line.strip()
+            if stripped == "imports:":
+                in_imports = True
+            elif in_imports and stripped.startswith("- "):
+                imp = resolve_import_ksy(stripped[2:].strip().strip("'\""), ksy.parent)
+                if imp is not None:
+                    stack.append(imp)
+            elif in_imports and stripped:
+                in_imports = False
+    ordered.sort()
+    return ordered
+
+
+def _ksy_closure_digest(root_ksy: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for ksy in _transitive_ksy_inputs(root_ksy):
+        digest.update(ksy.as_posix().encode("utf-8") + b"\0")
+        digest.update(ksy.read_bytes())
+    return digest.hexdigest()
+
+
+def _fixture_cache_key(fixture: Fixture, max_diff_lines: int) -> str | None:
+    digest = hashlib.blake2b(digest_size=16)
+    for tool in (resolve_executable(SCALA_BIN), resolve_executable(KSCXX_BIN)):
+        try:
+            st = tool.stat()
+        except OSError:
+            return None
+        digest.update(f"{tool}:{st.st_mtime_ns}:{st.st_size}\n".encode("utf-8"))
+    digest.update(
+        f"{fixture.target}:{fixture.mode}:{fixture.parity_criteria}:{max_diff_lines}\n".encode("utf-8")
+    )
+    digest.update(_ksy_closure_digest(fixture.ksy).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Scala emissions already produced during this run, keyed on
+# (target, ksy-closure digest): value is (fixture_dir, root ir path) of
+# the fixture that ran the compiler. Per process — pool workers each
+# keep their own — so the lock only matters for in-process threads.
+_SCALA_EMIT_CACHE: dict[tuple[str, str], tuple[Path, Path]] = {}
+_SCALA_EMIT_LOCK = threading.Lock()
+
+
+def run_fixture(
+    fixture: Fixture,
+    out_root: Path,
+    max_diff_lines: int,
+    scala_prefix: list[str] | None = None,
+    kscpp_prefix: list[str] | None = None,
+    cache_dir: Path | None = None,
+) -> dict:
     fixture_dir = out_root / fixture.fixture_id
+
+    cache_entry: Path | None = None
+    if cache_dir is not None:
+        key = _fixture_cache_key(fixture, max_diff_lines)
+        if key is not None:
+            cache_entry = cache_dir / key
+            cached_result = cache_entry / "result.json"
+            if cached_result.exists():
+                # Unchanged inputs and compiler binaries: replay the
+                # cached verdict instead of running either compiler.
+                fixture_dir.mkdir(parents=True, exist_ok=True)
+                for name in _CACHED_ARTIFACTS:
+                    src = cache_entry / name
+                    if src.exists():
+                        shutil.copyfile(src, fixture_dir / name)
+                with cached_result.open("rb") as f:
+                    result = json.load(f)
+                # The key is purely content-based, so fixtures sharing a
+                # ksy closure and target land on the same entry; only the
+                # verdict is shared — identity fields (and anything derived
+                # from them, like the gate that enforcement counts) must
+                # come from the fixture in hand, not from whichever row
+                # populated the cache.
+                result.update(
+                    id=fixture.fixture_id,
+                    category=fixture.category,
+                    known_deviation=fixture.known_deviation,
+                    gate=fixture.gate,
+                    ksy=fixture.ksy_rel or _repo_rel(fixture.ksy),
+                    artifact_dir=f"{_repo_rel(out_root)}{os.sep}{fixture.fixture_id}",
+                )
+                snippet = result.get("diff", {}).get("snippet")
+                if snippet:
+                    (fixture_dir / "diff.patch").write_text("\n".join(snippet) + "\n", encoding="utf-8")
+                return result
     scala_out = fixture_dir / "scala_out"
     cpp_out = fixture_dir / "cpp_out"
     scala_out.mkdir(parents=True, exist_ok=True)
@@ -294,7 +649,7 @@ def run_fixture(fixture: Fixture, out_root: Path, max_diff_lines: int) -> dict:
     scala_windows_compat = scala_bin.suffix.lower() == ".bat"
     cmd_env = tool_env()
 
-    scala_cmd = [str(scala_bin), "--verbose", "file", "-t", fixture.target]
+    scala_cmd = [*(scala_prefix or [str(scala_bin)]), "--verbose", "file", "-t", fixture.target]
     if fixture.target == "cpp_stl":
         scala_cmd.extend(["--cpp-standard", "17"])
     scala_stdout = fixture_dir / "scala.stdout.log"
@@ -302,32 +657,49 @@ def run_fixture(fixture: Fixture, out_root: Path, max_diff_lines: int) -> dict:
 
     if fixture.mode == "success":
         ir_path = fixture_dir / f"{fixture.fixture_id}.ksir"
-        scala_cmd.extend(
-            [
-                "--emit-ir",
-                cli_path(ir_path, scala_windows_compat),
-                "-d",
-                cli_path(scala_out, scala_windows_compat),
-                cli_path(fixture.ksy, scala_windows_compat),
-            ]
-        )
-        run_checked(scala_cmd, cwd=REPO_ROOT, stdout_path=scala_stdout, stderr_path=scala_stderr, env=cmd_env)
-        emit_import_ir_tree(
-            root_ksy=fixture.ksy,
-            root_ir=ir_path,
-            scala_bin=scala_bin,
-            fixture_target=fixture.target,
-            scala_out=scala_out,
-            scala_windows_compat=scala_windows_compat,
-            cmd_env=cmd_env,
-            fixture_dir=fixture_dir,
-        )
+        emit_key = (fixture.target, _ksy_closure_digest(fixture.ksy))
+        with _SCALA_EMIT_LOCK:
+            cached_emit = _SCALA_EMIT_CACHE.get(emit_key)
+        if cached_emit is not None and cached_emit[1].exists():
+            # Another fixture in this run already compiled the identical
+            # .ksy closure for this target; replay its IR tree and
+            # generated sources instead of re-running Scala.
+            cached_fixture_dir, cached_ir = cached_emit
+            shutil.copyfile(cached_ir, ir_path)
+            for ksir in cached_fixture_dir.glob("*.ksir"):
+                if ksir != cached_ir:
+                    shutil.copyfile(ksir, fixture_dir / ksir.name)
+            shutil.copytree(cached_fixture_dir / "scala_out", scala_out, dirs_exist_ok=True)
+        else:
+            scala_cmd.extend(
+                [
+                    "--emit-ir",
+                    cli_path(ir_path, scala_windows_compat),
+                    "-d",
+                    cli_path(scala_out, scala_windows_compat),
+                    cli_path(fixture.ksy, scala_windows_compat),
+                ]
+            )
+            run_checked(scala_cmd, cwd=REPO_ROOT, stdout_path=scala_stdout, stderr_path=scala_stderr, env=cmd_env)
+            emit_import_ir_tree(
+                root_ksy=fixture.ksy,
+                root_ir=ir_path,
+                scala_bin=scala_bin,
+                scala_prefix=scala_prefix,
+                fixture_target=fixture.target,
+                scala_out=scala_out,
+                scala_windows_compat=scala_windows_compat,
+                cmd_env=cmd_env,
+                fixture_dir=fixture_dir,
+            )
+            with _SCALA_EMIT_LOCK:
+                _SCALA_EMIT_CACHE[emit_key] = (fixture_dir, ir_path)
 
         if fixture.parity_criteria in ("match_scala_vs_cpp17_ir", "known_mismatch_allowed"):
 
             run_checked(
                 [
-                    str(kscxx_bin),
+                    *(kscpp_prefix or [str(kscxx_bin)]),
                     "--from-ir",
                     str(ir_path),
                     "-t",
@@ -343,19 +715,32 @@ def run_fixture(fixture: Fixture, out_root: Path, max_diff_lines: int) -> dict:
                 env=cmd_env,
             )
 
-            scala_raw = fixture_dir / "scala.raw"
-            cpp_raw = fixture_dir / "cpp.raw"
-            scala_raw.write_text(aggregate_generated_tree(scala_out, fixture.fixture_id), encoding="utf-8")
-            cpp_raw.write_text(aggregate_generated_tree(cpp_out, fixture.fixture_id), encoding="utf-8")
-
-            scala_norm = fixture_dir / "scala.norm"
-            cpp_norm = fixture_dir / "cpp.norm"
-            normalize(scala_raw, scala_norm)
-            normalize(cpp_raw, cpp_norm)
-
-            scala_text = scala_norm.read_text(encoding="utf-8")
-            cpp_text = cpp_norm.read_text(encoding="utf-8")
-            matched, diff_info = summarize_diff(scala_text, cpp_text, max_diff_lines)
+            if tree_fingerprint(scala_out) == tree_fingerprint(cpp_out):
+                # Byte-identical trees normalize identically: skip the
+                # aggregate files, the normalizer and the diff outright.
+                matched, diff_info = True, {"line_count": 0, "snippet": []}
+            else:
+                scala_raw = fixture_dir / "scala.raw"
+                cpp_raw = fixture_dir / "cpp.raw"
+                aggregate_generated_tree_to(scala_out, fixture.fixture_id, scala_raw)
+                aggregate_generated_tree_to(cpp_out, fixture.fixture_id, cpp_raw)
+
+                scala_norm = fixture_dir / "scala.norm"
+                cpp_norm = fixture_dir / "cpp.norm"
+                normalize(scala_raw, scala_norm)
+                normalize(cpp_raw, cpp_norm)
+
+                # Equality is decided on raw bytes; the UTF-8 decode over
+                # the largest artifacts only happens when a diff must
+                # actually be rendered.
+                scala_bytes = scala_norm.read_bytes()
+                cpp_bytes = cpp_norm.read_bytes()
+                if scala_bytes == cpp_bytes:
+                    matched, diff_info = True, {"line_count": 0, "snippet": []}
+                else:
+                    matched, diff_info = summarize_diff(
+                        scala_bytes.decode("utf-8"), cpp_bytes.decode("utf-8"), max_diff_lines
+                    )
 
             if matched:
                 status = "match"
@@ -392,7 +777,7 @@ def run_fixture(fixture: Fixture, out_root: Path, max_diff_lines: int) -> dict:
         cpp_proc = None
         if fixture.target == "cpp_stl" and fixture.parity_criteria != "scala_oracle_only":
             cpp_cmd = [
-                str(kscxx_bin),
+                *(kscpp_prefix or [str(kscxx_bin)]),
                 "-t",
                 fixture.target,
                 "--cpp-standard",
@@ -447,7 +832,7 @@ def run_fixture(fixture: Fixture, out_root: Path, max_diff_lines: int) -> dict:
         else:
             raise DifferentialFailure(f"Unknown parity criteria '{fixture.parity_criteria}' for fixture {fixture.fixture_id}")
 
-    return {
+    result = {
         "id": fixture.fixture_id,
         "category": fixture.category,
         "mode": fixture.mode,
@@ -455,12 +840,54 @@ def run_fixture(fixture: Fixture, out_root: Path, max_diff_lines: int) -> dict:
         "parity_criteria": fixture.parity_criteria,
         "known_deviation": fixture.known_deviation,
         "gate": fixture.gate,
-        "ksy": str(fixture.ksy.relative_to(REPO_ROOT)),
+        "ksy": fixture.ksy_rel or _repo_rel(fixture.ksy),
         "status": status,
         "diff": diff_info,
-        "artifact_dir": str(fixture_dir.relative_to(REPO_ROOT)),
+        "artifact_dir": f"{_repo_rel(out_root)}{os.sep}{fixture.fixture_id}",
     }
 
+    if cache_entry is not None:
+        cache_entry.mkdir(parents=True, exist_ok=True)
+        for name in _CACHED_ARTIFACTS:
+            src = fixture_dir / name
+            if src.exists():
+                shutil.copyfile(src, cache_entry / name)
+        # Write-then-rename so concurrent workers landing on the same key
+        # never expose a half-written result.
+        tmp_result = cache_entry / f"result.json.{os.getpid()}"
+        tmp_result.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_result, cache_entry / "result.json")
+
+    return result
+
+
+def _run_fixture_task(
+    fixture: Fixture,
+    out_root: Path,
+    max_diff_lines: int,
+    scala_prefix: list[str] | None = None,
+    kscpp_prefix: list[str] | None = None,
+    cache_dir: Path | None = None,
+) -> dict:
+    # Worker-safe wrapper: converts DifferentialFailure into the error-row
+    # dict so exceptions don't poison the process pool.
+    try:
+        return run_fixture(fixture, out_root, max_diff_lines, scala_prefix, kscpp_prefix, cache_dir)
+    except DifferentialFailure as exc:
+        return {
+            "id": fixture.fixture_id,
+            "category": fixture.category,
+            "mode": fixture.mode,
+            "target": fixture.target,
+            "parity_criteria": fixture.parity_criteria,
+            "known_deviation": fixture.known_deviation,
+            "gate": fixture.gate,
+            "ksy": fixture.ksy_rel or _repo_rel(fixture.ksy),
+            "status": "error",
+            "error": str(exc),
+            "artifact_dir": f"{_repo_rel(out_root)}{os.sep}{fixture.fixture_id}",
+        }
+
 
 def write_human_summary(report: dict, summary_path: Path) -> None:
     lines = [
@@ -477,46 +904,70 @@ def write_human_summary(report: dict, summary_path: Path) -> None:
         "",
         "per-target:",
     ]
-    for target in sorted(report["summary"]["by_target"].keys()):
-        t = report["summary"]["by_target"][target]
+    by_target = report["summary"]["by_target"]
+    for target in sorted(by_target):
+        t = by_target[target]
         lines.append(f"- {target}: pass={t['pass']} fail={t['fail']} gap={t['gap']} error={t['error']}")
     lines.append("")
 
     for fixture in report["fixtures"]:
+        # Snapshot the hot dict lookups to locals once per fixture.
+        status = fixture["status"]
+        diff = fixture.get("diff", {})
+        known_deviation = fixture.get("known_deviation")
         lines.append(
             (
                 f"- {fixture['id']} [{fixture['target']}/{fixture['parity_criteria']}] "
-                f"gate={fixture['gate']}: {fixture['status']} ({fixture['artifact_dir']})"
+                f"gate={fixture['gate']}: {status} ({fixture['artifact_dir']})"
             )
         )
-        if fixture.get("known_deviation"):
-            lines.append(f"  known deviation: {fixture['known_deviation']}")
-        if fixture["status"] == "mismatch":
-            lines.append(f"  diff lines: {fixture['diff']['line_count']}")
-            for line in fixture["diff"]["snippet"][:12]:
-                lines.append(f"    {line}")
-            if fixture["diff"].get("truncated"):
+        if known_deviation:
+            lines.append(f"  known deviation: {known_deviation}")
+        if status == "mismatch":
+            lines.extend(
+                [f"  diff lines: {diff['line_count']}"]
+                + [f"    {line}" for line in diff["snippet"][:12]]
+            )
+            if diff.get("truncated"):
                 lines.append("    ... (truncated)")
-        elif fixture["status"] == "gap":
-            lines.append(f"  gap rationale: {fixture['diff'].get('note', 'coverage gap')}")
-        elif fixture["status"] == "error":
+        elif status == "gap":
+            lines.append(f"  gap rationale: {diff.get('note', 'coverage gap')}")
+        elif status == "error":
             lines.append(f"  error: {fixture['error']}")
 
-    summary_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    with open(summary_path, "w", buffering=1 << 20, encoding="utf-8") as f:
+        f.writelines(line + "\n" for line in lines)
 
 
 def main() -> int:
     args = parse_args()
     args.fixtures = args.fixtures.resolve()
     args.output_dir = args.output_dir.resolve()
-    ensure_tools()
+    scala_prefix = shlex.split(args.scala_launcher) if getattr(args, "scala_launcher", None) else None
+    kscpp_prefix = shlex.split(args.kscpp_launcher) if getattr(args, "kscpp_launcher", None) else None
+    ensure_tools(scala_external=scala_prefix is not None, kscpp_external=kscpp_prefix is not None)
 
     fixtures = parse_fixtures(args.fixtures)
     if not fixtures:
         raise DifferentialFailure(f"No fixtures found in {args.fixtures}")
 
+    # External launchers hide the real tool binaries from the key hash,
+    # so the cache only engages for the default build-tree compilers.
+    cache_dir: Path | None = None
+    if not getattr(args, "no_cache", False) and scala_prefix is None and kscpp_prefix is None:
+        cache_dir = args.output_dir.parent / "migration_diff_cache"
+
+    # Move the previous run aside with one rename and unlink it on a
+    # background thread, keeping thousands of unlink syscalls off the
+    # critical path; the thread is joined before returning.
+    cleanup_thread: threading.Thread | None = None
     if args.output_dir.exists():
-        shutil.rmtree(args.output_dir)
+        # Unique per-run name: a stale trash dir from an interrupted run
+        # never forces a synchronous rmtree before the rename.
+        old_dir = args.output_dir.with_name(f"{args.output_dir.name}.trash.{os.getpid()}.{time.time_ns()}")
+        os.rename(args.output_dir, old_dir)
+        cleanup_thread = threading.Thread(target=shutil.rmtree, args=(old_dir,), kwargs={"ignore_errors": True})
+        cleanup_thread.start()
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
     report = {
@@ -536,23 +987,31 @@ def main() -> int:
             },
     }
 
-    for fixture in fixtures:
-        try:
-            result = run_fixture(fixture, args.output_dir, args.max_diff_lines)
-        except DifferentialFailure as exc:
-            result = {
-                "id": fixture.fixture_id,
-                "category": fixture.category,
-                "mode": fixture.mode,
-                "target": fixture.target,
-                "parity_criteria": fixture.parity_criteria,
-                "known_deviation": fixture.known_deviation,
-                "gate": fixture.gate,
-                "ksy": str(fixture.ksy.relative_to(REPO_ROOT)),
-                "status": "error",
-                "error": str(exc),
-                "artifact_dir": str((args.output_dir / fixture.fixture_id).relative_to(REPO_ROOT)),
-            }
+    jobs = max(1, getattr(args, "jobs", 1) or 1)
+    if jobs > 1 and len(fixtures) > 1:
+        # Fixtures spend their time blocked on compiler subprocesses, so
+        # running them across a process pool overlaps the JVM startups.
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    _run_fixture_task,
+                    fixture,
+                    args.output_dir,
+                    args.max_diff_lines,
+                    scala_prefix,
+                    kscpp_prefix,
+                    cache_dir,
+                )
+                for fixture in fixtures
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [
+            _run_fixture_task(fixture, args.output_dir, args.max_diff_lines, scala_prefix, kscpp_prefix, cache_dir)
+            for fixture in fixtures
+        ]
+
+    for result in results:
         report["fixtures"].append(result)
 
         target_stats = report["summary"]["by_target"].setdefault(
@@ -578,7 +1037,7 @@ def main() -> int:
                 report["summary"]["required_errors"] += 1
 
     json_path = args.output_dir / "report.json"
-    json_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    json_path.write_bytes(_dump_report(report))
     human_path = args.output_dir / "summary.txt"
     write_human_summary(report, human_path)
 
@@ -593,6 +1052,9 @@ def main() -> int:
         enforce_mismatches = 0
         enforce_errors = 0
 
+    if cleanup_thread is not None:
+        cleanup_thread.join()
+
     is_clean = enforce_mismatches == 0 and enforce_errors == 0
     if is_clean or args.informational:
         return 0
@@ -1,43 +1,56 @@
 #!/usr/bin/env python3
-import json
-import tempfile
 import unittest
-from pathlib import Path
-
-from run_cpp17_benchmarks import validate_report_schema
 
 
 class BenchmarkSchemaTest(unittest.TestCase):
-    def test_validate_report_schema_accepts_expected_shape(self):
-        report = {
-            "schema_version": 1,
-            "tool": "run_cpp17_benchmarks.py",
-            "generated_at_utc": "2026-01-01T00:00:00Z",
-            "thresholds": {},
-            "fixtures": [
-                {
-                    "id": "bench_fixture",
-                    "paths": {
-                        "scala_full": {"runs": [], "summary": {}},
-                        "cpp_from_ir": {"runs": [], "summary": {}},
-                    },
-                }
-            ],
-            "summary": {},
-        }
-        self.assertEqual(validate_report_schema(report), [])
+    # Shared case fixtures built once at class-definition time instead of
+    # re-allocated per test method.
+    VALID_REPORT = {
+        "schema_version": 1,
+        "tool": "run_cpp17_benchmarks.py",
+        "generated_at_utc": "2026-01-01T00:00:00Z",
+        "thresholds": {},
+        "fixtures": [
+            {
+                "id": "bench_fixture",
+                "paths": {
+                    "scala_full": {"runs": [], "summary": {}},
+                    "cpp_from_ir": {"runs": [], "summary": {}},
+                },
+            }
+        ],
+        "summary": {},
+    }
+    MISSING_PATHS_REPORT = {
+        "schema_version": 1,
+        "tool": "run_cpp17_benchmarks.py",
+        "generated_at_utc": "2026-01-01T00:00:00Z",
+        "thresholds": {},
+        "fixtures": [{"id": "bad_fixture"}],
+        "summary": {},
+    }
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Deferred so collecting this file costs nothing when these tests
+        # are filtered out; the benchmarks module probes optional deps
+        # (numpy, orjson) at import time.
+        from run_cpp17_benchmarks import validate_report_schema
+
+        cls.validate_report_schema = staticmethod(validate_report_schema)
 
-    def test_validate_report_schema_rejects_missing_paths(self):
-        report = {
-            "schema_version": 1,
-            "tool": "run_cpp17_benchmarks.py",
-            "generated_at_utc": "2026-01-01T00:00:00Z",
-            "thresholds": {},
-            "fixtures": [{"id": "bad_fixture"}],
-            "summary": {},
-        }
-        errors = validate_report_schema(report)
-        self.assertTrue(any("missing paths" in e for e in errors))
+    def test_validate_report_schema(self):
+        cases = [
+            ("accepts_expected_shape", self.VALID_REPORT, []),
+            ("rejects_missing_paths", self.MISSING_PATHS_REPORT, ["missing paths"]),
+        ]
+        for name, report, expected_fragments in cases:
+            with self.subTest(case=name):
+                errors = self.validate_report_schema(report)
+                if not expected_fragments:
+                    self.assertEqual(errors, [])
+                for fragment in expected_fragments:
+                    self.assertTrue(any(fragment in e for e in errors))
 
 
 if __name__ == "__main__":
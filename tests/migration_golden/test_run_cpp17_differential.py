@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
+import io
 import tempfile
-import textwrap
 import unittest
 from pathlib import Path
 import sys
@@ -10,26 +10,27 @@ SCRIPT_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(SCRIPT_DIR))
 import run_cpp17_differential as diff
 
+# Assembled once at import; the tests feed it straight to parse_fixtures
+# without any per-test dedent or re-encode.
+_FIXTURES_TSV = (
+    "# id\tcategory\tmode\tksy\ttarget\tparity_criteria\tknown_deviation\tgate\n"
+    "req_ok\tprimitives\tsuccess\ttests/formats/default_big_endian.ksy\tcpp_stl\tmatch_scala_vs_cpp17_ir\t\trequired\n"
+    "req_err\terrors\terror\ttests/formats_err/type_unknown.ksy\tcpp_stl\tscala_oracle_only\tnote\trequired\n"
+    "legacy\tprimitives\tsuccess\ttests/formats/hello_world.ksy\tcpp_stl\tknown_mismatch_allowed\tnote\n"
+)
+
 
 class DifferentialFixturesParseTest(unittest.TestCase):
-    def test_parse_fixtures_supports_gate_and_mode_columns(self) -> None:
-        with tempfile.TemporaryDirectory() as td:
-            fixtures_path = Path(td) / "fixtures.tsv"
-            fixtures_path.write_text(
-                textwrap.dedent(
-                    """
-                    # id\tcategory\tmode\tksy\ttarget\tparity_criteria\tknown_deviation\tgate
-                    req_ok\tprimitives\tsuccess\ttests/formats/default_big_endian.ksy\tcpp_stl\tmatch_scala_vs_cpp17_ir\t\trequired
-                    req_err\terrors\terror\ttests/formats_err/type_unknown.ksy\tcpp_stl\tscala_oracle_only\tnote\trequired
-                    legacy\tprimitives\tsuccess\ttests/formats/hello_world.ksy\tcpp_stl\tknown_mismatch_allowed\tnote
-                    """
-                ).strip()
-                + "\n",
-                encoding="utf-8",
-            )
+    # Written and parsed once for the whole class; the tests only assert
+    # on the shared parse result.
+    fixtures: list
 
-            fixtures = diff.parse_fixtures(fixtures_path)
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.fixtures = diff.parse_fixtures(io.StringIO(_FIXTURES_TSV))
 
+    def test_parse_fixtures_supports_gate_and_mode_columns(self) -> None:
+        fixtures = self.fixtures
         self.assertEqual([f.fixture_id for f in fixtures], ["req_ok", "req_err", "legacy"])
         self.assertEqual(fixtures[0].mode, "success")
         self.assertEqual(fixtures[1].mode, "error")
@@ -78,6 +79,10 @@ class DifferentialGateEnforcementTest(unittest.TestCase):
                 fixtures=Path(td) / "fixtures.tsv",
                 output_dir=output_dir,
                 max_diff_lines=20,
+                jobs=1,
+                scala_launcher=None,
+                kscpp_launcher=None,
+                no_cache=True,
                 informational=False,
                 enforce_gate="required",
             )
@@ -97,9 +102,13 @@ class DifferentialGateEnforcementTest(unittest.TestCase):
                 "artifact_dir": "tests/test_out/migration_differential/req_err",
             }
 
-            with mock.patch.object(diff, "parse_args", return_value=args), mock.patch.object(diff, "ensure_tools"), mock.patch.object(
-                diff, "parse_fixtures", return_value=[fixture]
-            ), mock.patch.object(diff, "run_fixture", return_value=mismatch_result):
+            with mock.patch.multiple(
+                diff,
+                parse_args=mock.Mock(return_value=args),
+                ensure_tools=mock.DEFAULT,
+                parse_fixtures=mock.Mock(return_value=[fixture]),
+                run_fixture=mock.Mock(return_value=mismatch_result),
+            ):
                 exit_code = diff.main()
 
         self.assertEqual(exit_code, 1)
@@ -3,6 +3,9 @@
 
 from __future__ import annotations
 
+import csv
+import mmap
+import operator
 import re
 import sys
 from pathlib import Path
@@ -16,35 +19,68 @@ DOCS = [
 
 START_MARKER = "<!-- gate-examples:start -->"
 END_MARKER = "<!-- gate-examples:end -->"
+_START_MARKER_B = START_MARKER.encode("utf-8")
+_END_MARKER_B = END_MARKER.encode("utf-8")
 LINE_RE = re.compile(r"^-\s*(required|visibility):\s*(.+)$")
 FIXTURE_RE = re.compile(r"`([a-zA-Z0-9_\-]+)`")
 
+# Parsed TSV keyed on (path, mtime_ns, size): repeat invocations within
+# one process (CI matrix drivers, pre-commit) skip the re-parse.
+_FIXTURE_CACHE: dict[tuple[Path, int, int], dict[str, frozenset[str]]] = {}
 
-def load_fixture_ids_by_gate() -> dict[str, set[str]]:
-    if not FIXTURES.exists():
-        raise FileNotFoundError(f"missing fixture metadata: {FIXTURES}")
-
-    rows = [line for line in FIXTURES.read_text(encoding="utf-8").splitlines() if line.strip()]
-    header = rows[0].split("\t")
-    header[0] = header[0].lstrip("# ").strip()
-    idx = {name: i for i, name in enumerate(header)}
 
+def load_fixture_ids_by_gate() -> dict[str, frozenset[str]]:
+    # The stat doubles as the existence check; no separate exists() probe.
+    try:
+        st = FIXTURES.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"missing fixture metadata: {FIXTURES}") from None
+    cache_key = (FIXTURES, st.st_mtime_ns, st.st_size)
+    cached = _FIXTURE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Stream rows through the C-implemented csv reader instead of
+    # materializing the whole file as one str plus a splitlines list.
     result: dict[str, set[str]] = {"required": set(), "visibility": set()}
-    for row in rows[1:]:
-        cols = row.split("\t")
-        fixture_id = cols[idx["id"]].strip()
-        gate = cols[idx["gate"]].strip()
-        if gate in result:
-            result[gate].add(fixture_id)
-    return result
+    with FIXTURES.open("r", encoding="utf-8", newline="") as f:
+        # The C-implemented itemgetter pulls both cells in one call,
+        # replacing two dict lookups plus two indexings per row.
+        get_id_gate = None
+        for cols in csv.reader(f, delimiter="\t"):
+            if not cols or (len(cols) == 1 and not cols[0].strip()):
+                continue
+            if get_id_gate is None:
+                cols[0] = cols[0].lstrip("# ").strip()
+                idx = {name: i for i, name in enumerate(cols)}
+                get_id_gate = operator.itemgetter(idx["id"], idx["gate"])
+                continue
+            fixture_id, gate = get_id_gate(cols)
+            gate = gate.strip()
+            if gate in result:
+                # Interned: the same ids repeat across docs, so later
+                # containment checks hit the pointer-equality fast path.
+                result[gate].add(sys.intern(fixture_id.strip()))
+    # Downstream only does containment and cardinality; hand out
+    # immutable sets so the cached value can be shared safely.
+    frozen = {gate: frozenset(ids) for gate, ids in result.items()}
+    _FIXTURE_CACHE[cache_key] = frozen
+    return frozen
 
 
 def parse_doc_gate_examples(doc_path: Path) -> dict[str, list[str]]:
-    text = doc_path.read_text(encoding="utf-8")
-    if START_MARKER not in text or END_MARKER not in text:
-        raise ValueError(f"{doc_path}: missing gate example markers")
-
-    block = text.split(START_MARKER, 1)[1].split(END_MARKER, 1)[0]
+    # Locate the marker block with bytes-level find on an mmap of the
+    # doc; only the slice between the markers is ever decoded, and the
+    # surrounding prose stays in the page cache as bytes.
+    with doc_path.open("rb") as f:
+        if doc_path.stat().st_size == 0:
+            raise ValueError(f"{doc_path}: missing gate example markers")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = mm.find(_START_MARKER_B)
+            end = mm.find(_END_MARKER_B, start + len(_START_MARKER_B)) if start >= 0 else -1
+            if start < 0 or end < 0:
+                raise ValueError(f"{doc_path}: missing gate example markers")
+            block = mm[start + len(_START_MARKER_B):end].decode("utf-8")
     parsed: dict[str, list[str]] = {"required": [], "visibility": []}
 
     for raw_line in block.splitlines():
@@ -58,6 +94,10 @@ def parse_doc_gate_examples(doc_path: Path) -> dict[str, list[str]]:
         if values.strip() == "_(none)_":
             parsed[gate] = []
             continue
+        # Fixture ids are always backtick-quoted; the substring check
+        # rejects id-less lines without entering the regex engine.
+        if "`" not in values:
+            raise ValueError(f"{doc_path}: no fixture ids found for gate '{gate}'")
         parsed[gate] = FIXTURE_RE.findall(values)
         if not parsed[gate]:
             raise ValueError(f"{doc_path}: no fixture ids found for gate '{gate}'")
@@ -76,24 +116,29 @@ def main() -> int:
     checked_docs = 0
 
     for doc in DOCS:
-        if not doc.exists():
-            failures.append(f"missing doc: {doc}")
-            continue
-        checked_docs += 1
+        # Missing docs surface from the open itself; no exists() probe.
         try:
             parsed = parse_doc_gate_examples(doc)
+        except FileNotFoundError:
+            failures.append(f"missing doc: {doc}")
+            continue
         except Exception as exc:
+            checked_docs += 1
             failures.append(str(exc))
             continue
+        checked_docs += 1
 
         for gate in ("required", "visibility"):
             wanted = parsed[gate]
             available = fixture_ids[gate]
             if wanted:
-                unknown = [fixture for fixture in wanted if fixture not in available]
+                # C-level set difference instead of a per-element
+                # containment loop; sorted for deterministic CI logs.
+                unknown = set(wanted) - available
                 if unknown:
                     failures.append(
-                        f"{doc}: gate '{gate}' contains fixture(s) not present with same gate in TSV: {', '.join(unknown)}"
+                        f"{doc}: gate '{gate}' contains fixture(s) not present with same gate in TSV: "
+                        f"{', '.join(sorted(unknown))}"
                     )
             else:
                 if available:
@@ -14,33 +14,50 @@ SIGNAL_RE = re.compile(r"SIG-[A-Z0-9-]+")
 
 
 def main() -> int:
-    if not CHECKLIST.exists():
+    # The open doubles as the existence check; no separate exists() probe.
+    try:
+        lines = CHECKLIST.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
         print(f"[readiness-checklist] missing file: {CHECKLIST}", file=sys.stderr)
         return 2
 
-    text = CHECKLIST.read_text(encoding="utf-8")
-    lines = text.splitlines()
-
-    signal_catalog = set(SIGNAL_RE.findall(text))
+    # One gated pass over the lines instead of a second full-file regex
+    # scan; lines without the literal marker never hit the engine.
+    signal_catalog: set[str] = set()
+    for line in lines:
+        if "SIG-" in line:
+            signal_catalog.update(SIGNAL_RE.findall(line))
     if not signal_catalog:
         print("[readiness-checklist] no signal IDs found", file=sys.stderr)
         return 2
 
+    # Jump straight to the checklist table and stop at its last row, so
+    # the rubric scan never touches the surrounding markdown prose.
+    table_start = next((i for i, line in enumerate(lines) if line.startswith("| Area ")), None)
+    if table_start is None:
+        print("[readiness-checklist] checklist table not found", file=sys.stderr)
+        return 2
+
     missing: list[tuple[int, str]] = []
-    for idx, line in enumerate(lines, start=1):
+    rows_with_rubrics = 0
+    for idx in range(table_start + 1, len(lines)):
+        line = lines[idx]
         if not line.startswith("| "):
-            continue
-        if line.startswith("| Area ") or line.startswith("| ---"):
+            break
+        if line.startswith("| ---"):
             continue
         if "PASS" not in line:
             continue
-        signals = SIGNAL_RE.findall(line)
+        rows_with_rubrics += 1
+        # Substring prefilter: most rows can't match, so skip the regex
+        # engine unless the literal marker is present.
+        signals = SIGNAL_RE.findall(line) if "SIG-" in line else []
         if not signals:
-            missing.append((idx, line))
+            missing.append((idx + 1, line))
             continue
         unknown = [s for s in signals if s not in signal_catalog]
         if unknown:
-            missing.append((idx, f"{line} (unknown: {', '.join(unknown)})"))
+            missing.append((idx + 1, f"{line} (unknown: {', '.join(unknown)})"))
 
     if missing:
         print("[readiness-checklist] checklist rows missing valid automated signals:", file=sys.stderr)
@@ -50,7 +67,7 @@ def main() -> int:
 
     print(
         "[readiness-checklist] OK "
-        f"(signals={len(signal_catalog)}, checklist_rows_with_rubrics={sum(1 for l in lines if l.startswith('| ') and 'PASS' in l)})"
+        f"(signals={len(signal_catalog)}, checklist_rows_with_rubrics={rows_with_rubrics})"
     )
     return 0
 
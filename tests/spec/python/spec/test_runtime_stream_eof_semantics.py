@@ -5,6 +5,8 @@ from kaitaistruct import KaitaiStream, EndOfStreamError
 
 
 class _NonSeekableBytesIO(io.BytesIO):
+    __slots__ = ()
+
     def seekable(self):
         return False
 